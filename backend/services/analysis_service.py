@@ -5,28 +5,20 @@ Handles meeting transcription analysis with open source LLM
 
 import json
 import os
-import sys
-from groq import Groq
-from typing import Dict, Optional
-
-# Add project root to path for imports
-# This ensures backend.* imports work from anywhere
-_current_file = os.path.abspath(__file__)
-# Current: backend/services/analysis_service.py
-# Go up 2 levels: backend/services -> backend -> project root
-_backend_dir = os.path.dirname(os.path.dirname(_current_file))  # backend/
-_project_root = os.path.dirname(_backend_dir)  # project root
-
-# Ensure project root is in path (check and add if needed)
-if _project_root not in sys.path:
-    sys.path.insert(0, _project_root)
-
-# Import using absolute import (now that path is set)
-# Use a try-except to handle import errors gracefully
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from difflib import SequenceMatcher
+import httpx
+from groq import AuthenticationError, BadRequestError, Groq, PermissionDeniedError, RateLimitError
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..utils.cache import DEFAULT_CACHE_DIR, ResultCache, content_hash, json_loads
+
 # In production (GitHub Actions, Streamlit Cloud), we only need environment variables
-# The config.py file is only for local development
+# The config module is only for local development
 try:
-    from backend.utils.config import get_groq_api_key
+    from ..utils.config import get_groq_api_key
 except ImportError:
     # Fallback: define get_groq_api_key directly using environment variables
     # This works in GitHub Actions where secrets are set as environment variables
@@ -44,15 +36,310 @@ except ImportError:
         return api_key
 
 
+# Groq models tried in order until one succeeds
+DEFAULT_MODELS = [
+    "llama-3.1-8b-instant",      # Fast and efficient model
+    "llama-3.3-70b-versatile",  # More powerful model
+    "mixtral-8x7b-32768"        # Alternative model
+]
+
+# Transcripts longer than this are analyzed with map-reduce over chunks
+SINGLE_CALL_MAX_TOKENS = 2000
+# Size of the chunks analyzed in parallel for long transcripts
+CHUNK_MAX_TOKENS = 3000
+# Chunk analyses sent to Groq at once (matches the HTTP connection pool size)
+MAX_PARALLEL_CHUNKS = 16
+
+# HTTP/2 multiplexing needs the optional "h2" package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# Keep-alive connection pool shared by every AnalysisService (see _get_http_client)
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def _get_http_client() -> httpx.Client:
+    """
+    Get the HTTP client shared by all Groq clients, created on first use.
+    Reusing its connections avoids a new TCP and TLS handshake per request,
+    per model fallback and per service instance.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_keepalive_connections=MAX_PARALLEL_CHUNKS,
+                    max_connections=MAX_PARALLEL_CHUNKS
+                ),
+                timeout=httpx.Timeout(60.0, connect=5.0)
+            )
+    return _http_client
+
+
+# Context window of the Groq models, in tokens
+MODEL_CONTEXT_TOKENS = {
+    "llama-3.1-8b-instant": 131072,
+    "llama-3.3-70b-versatile": 131072,
+    "mixtral-8x7b-32768": 32768
+}
+# Tokens kept free in the context window for the model's answer
+_ANSWER_TOKENS = 1024
+
+# Errors that no other model can fix (invalid key, malformed request): fail fast
+_PERMANENT_ERRORS = (AuthenticationError, PermissionDeniedError, BadRequestError)
+# Bad-request codes tied to one model's answer or limits: the next model may succeed
+_MODEL_SPECIFIC_ERROR_CODES = {
+    "json_validate_failed",
+    "context_length_exceeded",
+    "model_decommissioned",
+}
+# Rate-limited requests are retried on the same model, waiting as asked by Groq
+RATE_LIMIT_RETRIES = 2
+_MAX_RATE_LIMIT_WAIT = 30.0
+
+
+def _is_permanent_error(error: Exception) -> bool:
+    """
+    Tell whether a Groq error would fail the same way with every model.
+    
+    Args:
+        error: Exception raised by a Groq request
+        
+    Returns:
+        True for invalid keys, denied access and malformed requests, False for
+        any other error (including model-specific bad requests)
+    """
+    if not isinstance(error, _PERMANENT_ERRORS):
+        return False
+    if isinstance(error, BadRequestError):
+        body = error.body
+        if isinstance(body, dict) and isinstance(body.get("error"), dict):
+            body = body["error"]
+        code = body.get("code") if isinstance(body, dict) else None
+        if code in _MODEL_SPECIFIC_ERROR_CODES:
+            return False
+    return True
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimate the number of LLM tokens in a text.
+    Uses the common approximation of ~4 characters per token.
+    """
+    return len(text) // 4
+
+
+# Instructions for the different analysis requests
+_MEETING_SYSTEM_PROMPT = """You are an expert assistant for analyzing professional meetings.
+Analyze a meeting transcription and provide:
+1. A concise executive summary (3-4 sentences)
+2. A list of action items with identified responsible persons
+
+Respond ONLY in JSON format with this exact structure:
+{
+    "resume_executif": "Concise summary in 3-4 sentences (use the same language as the transcription)",
+    "action_items": [
+        {"tache": "Task description", "responsable": "Person's name or 'To be determined'"},
+        ...
+    ]
+}
+
+Use the same language as the transcription (English or French)."""
+
+_CHUNK_SYSTEM_PROMPT = """You are an expert assistant for analyzing professional meetings.
+You receive ONE PART of a longer meeting transcription. Analyze this part only and provide:
+1. A short summary of this part (2-3 sentences)
+2. A list of action items mentioned in this part with identified responsible persons
+
+Respond ONLY in JSON format with this exact structure:
+{
+    "resume_executif": "Short summary of this part (use the same language as the transcription)",
+    "action_items": [
+        {"tache": "Task description", "responsable": "Person's name or 'To be determined'"},
+        ...
+    ]
+}
+
+Use the same language as the transcription (English or French)."""
+
+_MERGE_SYSTEM_PROMPT = """You are an expert assistant for analyzing professional meetings.
+You receive the summaries of consecutive parts of one meeting and its action items.
+Write a concise executive summary of the whole meeting (3-4 sentences).
+
+Respond ONLY in JSON format with this exact structure:
+{
+    "resume_executif": "Concise summary in 3-4 sentences (use the same language as the parts)"
+}
+
+Use the same language as the parts (English or French)."""
+
+# Prompt sizes, computed once rather than for every request
+_PROMPT_TOKENS = {
+    prompt: estimate_tokens(prompt)
+    for prompt in (_MEETING_SYSTEM_PROMPT, _CHUNK_SYSTEM_PROMPT, _MERGE_SYSTEM_PROMPT)
+}
+
+
+def split_text(text: str, max_tokens: int = CHUNK_MAX_TOKENS) -> List[str]:
+    """
+    Split a text into consecutive chunks of at most ~max_tokens tokens,
+    cutting between words.
+    
+    Args:
+        text: Text to split
+        max_tokens: Approximate maximum number of tokens per chunk
+        
+    Returns:
+        List[str]: The chunks, in order
+    """
+    chunks = []
+    words = []
+    chunk_tokens = 0
+    
+    for word in text.split():
+        word_tokens = estimate_tokens(word) + 1
+        if words and chunk_tokens + word_tokens > max_tokens:
+            chunks.append(" ".join(words))
+            words = []
+            chunk_tokens = 0
+        words.append(word)
+        chunk_tokens += word_tokens
+    
+    if words:
+        chunks.append(" ".join(words))
+    
+    return chunks
+
+
+def merge_action_items(action_items: List[Dict], similarity_threshold: float = 0.85) -> List[Dict]:
+    """
+    Remove duplicate action items, comparing task descriptions fuzzily.
+    
+    Args:
+        action_items: Action items ({"tache": ..., "responsable": ...}) in order
+        similarity_threshold: Similarity ratio (0-1) above which two tasks are duplicates
+        
+    Returns:
+        List[Dict]: Action items without duplicates, first occurrence kept
+    """
+    merged = []
+    seen_tasks = []
+    
+    for item in action_items:
+        # Model output is not guaranteed to follow the schema: skip malformed items
+        if not isinstance(item, dict) or not isinstance(item.get("tache"), str):
+            continue
+        
+        task = item["tache"].strip().lower()
+        if not task:
+            continue
+        if any(
+            SequenceMatcher(None, task, seen_task).ratio() >= similarity_threshold
+            for seen_task in seen_tasks
+        ):
+            continue
+        
+        merged.append(item)
+        seen_tasks.append(task)
+    
+    return merged
+
+
+def parse_partial_json(text: str) -> Optional[Dict]:
+    """
+    Best-effort parse of a JSON object that may be incomplete (e.g. still streaming).
+    Unterminated strings, arrays and objects are closed, and an incomplete
+    trailing member is dropped. Text around the object (an introduction,
+    a Markdown code fence) is ignored.
+    
+    Args:
+        text: JSON text, possibly truncated
+        
+    Returns:
+        Optional[Dict]: The parsed object, or None if nothing usable can be parsed
+    """
+    # Without JSON mode, models may write "Here is the JSON:\n```json\n{..."
+    start = text.find("{")
+    if start == -1:
+        return None
+    text = text[start:]
+    
+    closers = []
+    in_string = False
+    escaped = False
+    # Positions where the text can be cut while keeping valid JSON once closed
+    cut_points = []
+    
+    for idx, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+            cut_points.append((idx + 1, "".join(reversed(closers))))
+        elif char in "}]":
+            if closers:
+                closers.pop()
+            if not closers:
+                # End of the object: drop what follows (closing fence, comments)
+                text = text[:idx + 1]
+                break
+            cut_points.append((idx + 1, "".join(reversed(closers))))
+        elif char == ",":
+            cut_points.append((idx, "".join(reversed(closers))))
+    
+    candidates = []
+    if in_string and not escaped:
+        # Keep the partial string (typically the summary being written)
+        candidates.append(text + '"' + "".join(reversed(closers)))
+    candidates.append(text + "".join(reversed(closers)))
+    candidates.extend(text[:idx] + suffix for idx, suffix in reversed(cut_points))
+    
+    for candidate in candidates:
+        try:
+            value = json_loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(value, dict):
+            return value
+    
+    return None
+
+
 class AnalysisService:
     """Service for analyzing meeting transcriptions using Groq API"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self, 
+        api_key: Optional[str] = None,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        race_models: bool = False
+    ):
         """
         Initialize the analysis service with Groq client.
         
         Args:
             api_key: Groq API key (if None, will try to load from environment/config)
+            cache_dir: Directory where analyses are cached across runs
+                (None = in-memory cache only)
+            race_models: Query all models at once and keep the first valid
+                answer instead of falling back one model at a time (faster
+                when a model is failing, but uses more of the API quota).
+                The app enables it with MEETFLOW_RACE_MODELS=1
             
         Raises:
             ValueError: If API key cannot be found
@@ -62,9 +349,17 @@ class AnalysisService:
             api_key = get_groq_api_key()
         
         try:
-            self.client = Groq(api_key=api_key)
+            self.http_client = _get_http_client()
+            # Retries are handled by this service, which knows when to wait,
+            # when to move to the next model and when to give up
+            self.client = Groq(api_key=api_key, http_client=self.http_client, max_retries=0)
         except Exception as e:
             raise Exception(f"Error initializing Groq client: {str(e)}")
+        
+        self.race_models = race_models
+        
+        # Identical requests (same prompt, text and models) reuse the previous answer
+        self.cache = ResultCache(maxsize=128, cache_dir=cache_dir)
     
     def analyze_meeting(
         self, 
@@ -81,71 +376,472 @@ class AnalysisService:
         Returns:
             Dict: Analysis results with "resume_executif" and "action_items"
             
+        Raises:
+            Exception: If analysis fails for all models
+        """
+        chunks = split_text(transcription_text)
+        if estimate_tokens(transcription_text) > SINGLE_CALL_MAX_TOKENS and len(chunks) > 1:
+            # Long meeting: analyze the chunks in parallel, then merge
+            return self.merge_analyses(self._analyze_chunks(chunks, models_to_try), models_to_try)
+        
+        system_prompt, user_content = self._meeting_prompt(transcription_text)
+        return self._request_analysis(system_prompt, user_content, models_to_try)
+    
+    def stream_meeting_analysis(
+        self, 
+        transcription_text: str,
+        models_to_try: Optional[list] = None
+    ) -> Iterator[Dict]:
+        """
+        Analyze a meeting transcription, streaming the answer as it is generated.
+        
+        Args:
+            transcription_text: The transcribed meeting text
+            models_to_try: List of Groq models to try (default: predefined list)
+            
+        Yields:
+            Dict: Increasingly complete analyses; the last one is the final result
+            
+        Raises:
+            Exception: If analysis fails for all models
+        """
+        chunks = split_text(transcription_text)
+        if estimate_tokens(transcription_text) > SINGLE_CALL_MAX_TOKENS and len(chunks) > 1:
+            # Long meeting: analyze the chunks in parallel, then stream the merge
+            return self.stream_merged_analysis(self._analyze_chunks(chunks, models_to_try), models_to_try)
+        
+        system_prompt, user_content = self._meeting_prompt(transcription_text)
+        return self._stream_analysis(system_prompt, user_content, models_to_try)
+    
+    def analyze_chunk(
+        self, 
+        chunk_text: str,
+        models_to_try: Optional[list] = None
+    ) -> Dict:
+        """
+        Analyze one part of a longer meeting transcription.
+        Used to start the analysis while the rest of the audio is still
+        being transcribed; partial results are combined with merge_analyses.
+        
+        Args:
+            chunk_text: A contiguous part of the transcribed meeting text
+            models_to_try: List of Groq models to try (default: predefined list)
+            
+        Returns:
+            Dict: Partial analysis with "resume_executif" and "action_items"
+            
+        Raises:
+            Exception: If analysis fails for all models
+        """
+        return self._request_analysis(
+            _CHUNK_SYSTEM_PROMPT,
+            f"Analyze this part of a meeting transcription:\n\n{chunk_text}",
+            models_to_try
+        )
+    
+    def merge_analyses(
+        self, 
+        partial_analyses: List[Dict],
+        models_to_try: Optional[list] = None
+    ) -> Dict:
+        """
+        Combine the partial analyses of consecutive transcription parts
+        into a single meeting analysis.
+        
+        Args:
+            partial_analyses: Results of analyze_chunk, in meeting order
+            models_to_try: List of Groq models to try (default: predefined list)
+            
+        Returns:
+            Dict: Analysis results with "resume_executif" and "action_items"
+            
+        Raises:
+            Exception: If analysis fails for all models
+        """
+        action_items = self._merged_action_items(partial_analyses)
+        system_prompt, user_content = self._merge_prompt(partial_analyses, action_items)
+        
+        analysis_data = dict(self._request_analysis(system_prompt, user_content, models_to_try))
+        analysis_data["action_items"] = action_items
+        return analysis_data
+    
+    def stream_merged_analysis(
+        self, 
+        partial_analyses: List[Dict],
+        models_to_try: Optional[list] = None
+    ) -> Iterator[Dict]:
+        """
+        Combine partial analyses like merge_analyses, streaming the answer
+        as it is generated.
+        
+        Args:
+            partial_analyses: Results of analyze_chunk, in meeting order
+            models_to_try: List of Groq models to try (default: predefined list)
+            
+        Yields:
+            Dict: Increasingly complete analyses; the last one is the final result
+            
+        Raises:
+            Exception: If analysis fails for all models
+        """
+        action_items = self._merged_action_items(partial_analyses)
+        system_prompt, user_content = self._merge_prompt(partial_analyses, action_items)
+        
+        # Action items are merged locally, so they are available right away
+        return (
+            {**analysis_data, "action_items": action_items}
+            for analysis_data in self._stream_analysis(system_prompt, user_content, models_to_try)
+        )
+    
+    def _analyze_chunks(
+        self, 
+        chunks: List[str],
+        models_to_try: Optional[list] = None
+    ) -> List[Dict]:
+        """
+        Analyze transcription chunks in parallel with analyze_chunk.
+        All chunks are in flight at once (up to MAX_PARALLEL_CHUNKS), so the
+        map step takes about as long as the slowest chunk, whatever the length.
+        
+        Returns:
+            List[Dict]: Partial analyses, in chunk order
+        """
+        max_workers = max(1, min(len(chunks), MAX_PARALLEL_CHUNKS))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda chunk: self.analyze_chunk(chunk, models_to_try),
+                chunks
+            ))
+    
+    @staticmethod
+    def _merged_action_items(partial_analyses: List[Dict]) -> List[Dict]:
+        """
+        Collect the action items of all partial analyses, without duplicates.
+        """
+        action_items = []
+        for analysis in partial_analyses:
+            items = analysis.get("action_items") if isinstance(analysis, dict) else None
+            # "action_items" may be missing, null or not a list in model output
+            if isinstance(items, list):
+                action_items.extend(items)
+        return merge_action_items(action_items)
+    
+    @staticmethod
+    def _meeting_prompt(transcription_text: str) -> Tuple[str, str]:
+        """
+        Build the system prompt and user message for a full meeting analysis.
+        """
+        return _MEETING_SYSTEM_PROMPT, f"Analyze this meeting transcription:\n\n{transcription_text}"
+    
+    @staticmethod
+    def _merge_prompt(partial_analyses: List[Dict], action_items: List[Dict]) -> Tuple[str, str]:
+        """
+        Build the system prompt and user message summarizing partial analyses.
+        """
+        meeting_parts = json.dumps(
+            {
+                "parties": [
+                    analysis.get("resume_executif", "")
+                    for analysis in partial_analyses
+                ],
+                "action_items": action_items
+            },
+            ensure_ascii=False
+        )
+        
+        return _MERGE_SYSTEM_PROMPT, f"Summarize this meeting from its parts:\n\n{meeting_parts}"
+    
+    def _request_analysis(
+        self, 
+        system_prompt: str,
+        user_content: str,
+        models_to_try: Optional[list] = None
+    ) -> Dict:
+        """
+        Send an analysis request to Groq, falling back through the models.
+        
+        Args:
+            system_prompt: Instructions describing the expected JSON output
+            user_content: User message containing the text to analyze
+            models_to_try: List of Groq models to try (default: predefined list)
+            
+        Returns:
+            Dict: Parsed JSON analysis
+            
         Raises:
             Exception: If analysis fails for all models
         """
         if models_to_try is None:
-            models_to_try = [
-                "llama-3.1-8b-instant",      # Fast and efficient model
-                "llama-3.3-70b-versatile",  # More powerful model
-                "mixtral-8x7b-32768"        # Alternative model
-            ]
+            models_to_try = DEFAULT_MODELS
         
-        system_prompt = """You are an expert assistant for analyzing professional meetings.
-        Analyze a meeting transcription and provide:
-        1. A concise executive summary (3-4 sentences)
-        2. A list of action items with identified responsible persons
-        
-        Respond ONLY in JSON format with this exact structure:
-        {
-            "resume_executif": "Concise summary in 3-4 sentences (use the same language as the transcription)",
-            "action_items": [
-                {"tache": "Task description", "responsable": "Person's name or 'To be determined'"},
-                ...
-            ]
-        }
+        cache_key = content_hash(system_prompt, user_content, *models_to_try)
+        cached_analysis = self.cache.get(cache_key)
+        # Non-object answers cached by older versions are ignored
+        if isinstance(cached_analysis, dict):
+            return cached_analysis
         
-        Use the same language as the transcription (English or French)."""
+        models_to_try = self._models_fitting_request(system_prompt, user_content, models_to_try)
+        # Built once and shared by every model attempt
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
+        ]
         
         analysis_data = None
+        well_formed = False
+        last_error = None
+        
+        if self.race_models and len(models_to_try) > 1:
+            executor = ThreadPoolExecutor(max_workers=len(models_to_try))
+            futures = [
+                executor.submit(self._call_model, model_name, messages)
+                for model_name in models_to_try
+            ]
+            try:
+                for future in as_completed(futures):
+                    try:
+                        answer, answer_well_formed = future.result()
+                    except Exception as e:
+                        if _is_permanent_error(e):
+                            raise
+                        last_error = e
+                        continue
+                    if answer_well_formed:
+                        analysis_data, well_formed = answer, True
+                        break  # First valid answer wins
+                    if analysis_data is None:
+                        # Raw-content fallback: kept only if no model answers valid JSON
+                        analysis_data = answer
+            finally:
+                # Don't wait for the slower models
+                executor.shutdown(wait=False, cancel_futures=True)
+        else:
+            for model_name in models_to_try:
+                try:
+                    analysis_data, well_formed = self._call_model(model_name, messages)
+                    break  # Success, exit loop
+                    
+                except Exception as e:
+                    if _is_permanent_error(e):
+                        raise  # Would fail the same way with every model
+                    last_error = e
+                    continue  # Try next model
+        
+        if analysis_data is None:
+            raise Exception(f"All models failed. Last error: {str(last_error)}")
+        
+        # Only well-formed answers are cached, not the raw-content fallback
+        if well_formed:
+            self.cache.set(cache_key, analysis_data)
+        
+        return analysis_data
+    
+    def _call_model(
+        self, 
+        model_name: str,
+        messages: List[Dict]
+    ) -> Tuple[Dict, bool]:
+        """
+        Send an analysis request to a single Groq model.
+        
+        Args:
+            model_name: Groq model to use
+            messages: Chat messages (system prompt and text to analyze)
+            
+        Returns:
+            Tuple[Dict, bool]: Analysis, and whether the answer was valid JSON
+            
+        Raises:
+            Exception: If the Groq request fails
+        """
+        response = self._create_completion(
+            model=model_name,
+            messages=messages,
+            temperature=0.7,
+            response_format={"type": "json_object"}
+        )
+        
+        return self._parse_analysis(response.choices[0].message.content)
+    
+    def _create_completion(self, **request):
+        """
+        Send a chat completion request, waiting and retrying on the same model
+        when Groq rate-limits it.
+        
+        Args:
+            **request: Arguments of client.chat.completions.create
+            
+        Returns:
+            The completion (or stream, if stream=True)
+            
+        Raises:
+            RateLimitError: If still rate-limited after RATE_LIMIT_RETRIES retries
+            Exception: If the Groq request fails
+        """
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            try:
+                return self.client.chat.completions.create(**request)
+            except RateLimitError as e:
+                if attempt == RATE_LIMIT_RETRIES:
+                    raise
+                time.sleep(self._retry_after(e, default=2.0 ** attempt))
+    
+    @staticmethod
+    def _retry_after(error: RateLimitError, default: float) -> float:
+        """
+        Get the wait in seconds requested by a rate-limit answer (Retry-After header).
+        """
+        try:
+            wait = float(error.response.headers.get("retry-after", default))
+        except (AttributeError, TypeError, ValueError):
+            wait = default
+        return min(max(wait, 0.0), _MAX_RATE_LIMIT_WAIT)
+    
+    def _stream_analysis(
+        self, 
+        system_prompt: str,
+        user_content: str,
+        models_to_try: Optional[list] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream an analysis request to Groq, falling back through the models
+        until one starts answering.
+        
+        JSON mode is not used here since Groq does not support it with
+        streaming; the partial answer is parsed as tokens arrive instead.
+        
+        Args:
+            system_prompt: Instructions describing the expected JSON output
+            user_content: User message containing the text to analyze
+            models_to_try: List of Groq models to try (default: predefined list)
+            
+        Yields:
+            Dict: Increasingly complete analyses; the last one is the final result
+            
+        Raises:
+            Exception: If analysis fails for all models
+        """
+        if models_to_try is None:
+            models_to_try = DEFAULT_MODELS
+        
+        cache_key = content_hash(system_prompt, user_content, *models_to_try)
+        cached_analysis = self.cache.get(cache_key)
+        # Non-object answers cached by older versions are ignored
+        if isinstance(cached_analysis, dict):
+            yield cached_analysis
+            return
+        
+        models_to_try = self._models_fitting_request(system_prompt, user_content, models_to_try)
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
+        ]
         last_error = None
-        response = None
         
         for model_name in models_to_try:
+            raw_content = ""
+            partial_analysis = None
+            
             try:
-                response = self.client.chat.completions.create(
+                stream = self._create_completion(
                     model=model_name,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": f"Analyze this meeting transcription:\n\n{transcription_text}"}
-                    ],
+                    messages=messages,
                     temperature=0.7,
-                    response_format={"type": "json_object"}
+                    stream=True
                 )
                 
-                # Parse JSON response
-                analysis_data = json.loads(response.choices[0].message.content)
-                break  # Success, exit loop
-                
-            except json.JSONDecodeError as e:
-                # If it's a JSON error, keep the response for fallback
-                last_error = e
-                if response:
-                    # Fallback: use raw content
-                    raw_content = response.choices[0].message.content
-                    analysis_data = {
-                        "resume_executif": raw_content[:500] if len(raw_content) > 500 else raw_content,
-                        "action_items": []
-                    }
-                    break
-                continue  # Try next model
+                # Closing the stream stops generation if the consumer stops early
+                with stream:
+                    for chunk in stream:
+                        if not chunk.choices or not chunk.choices[0].delta.content:
+                            continue
+                        raw_content += chunk.choices[0].delta.content
+                        
+                        parsed = parse_partial_json(raw_content)
+                        if parsed is not None and parsed != partial_analysis:
+                            partial_analysis = parsed
+                            yield partial_analysis
                 
             except Exception as e:
+                if _is_permanent_error(e):
+                    raise  # Would fail the same way with every model
+                if partial_analysis is not None:
+                    # Results were already shown: don't restart with another model
+                    raise Exception(f"Analysis interrupted: {str(e)}")
                 last_error = e
                 continue  # Try next model
+            
+            analysis_data, well_formed = self._parse_analysis(raw_content)
+            if well_formed:
+                self.cache.set(cache_key, analysis_data)
+            yield analysis_data
+            return
+        
+        raise Exception(f"All models failed. Last error: {str(last_error)}")
+    
+    @staticmethod
+    def _models_fitting_request(
+        system_prompt: str,
+        user_content: str,
+        models_to_try: list
+    ) -> list:
+        """
+        Keep only the models whose context window can hold the request,
+        so no request is sent that is certain to fail.
+        
+        Raises:
+            Exception: If the request is too long for every model
+        """
+        prompt_tokens = _PROMPT_TOKENS.get(system_prompt)
+        if prompt_tokens is None:
+            prompt_tokens = estimate_tokens(system_prompt)
+        request_tokens = prompt_tokens + estimate_tokens(user_content) + _ANSWER_TOKENS
+        
+        fitting_models = [
+            model_name for model_name in models_to_try
+            # Unknown models are assumed to be large enough
+            if request_tokens <= MODEL_CONTEXT_TOKENS.get(model_name, request_tokens)
+        ]
+        if not fitting_models:
+            raise Exception(
+                f"Text too long for the selected models (~{request_tokens} tokens needed)"
+            )
+        
+        return fitting_models
+    
+    @staticmethod
+    def _parse_analysis(raw_content: str) -> Tuple[Dict, bool]:
+        """
+        Parse a model answer into an analysis dict.
         
+        Returns:
+            Tuple[Dict, bool]: Analysis, and whether the answer was valid JSON
+        """
+        try:
+            # Parse JSON response
+            analysis_data = json_loads(raw_content)
+        except ValueError:
+            analysis_data = None
         if analysis_data is None:
-            raise Exception(f"All models failed. Last error: {str(last_error)}")
+            # The object wrapped in text or a Markdown code fence (no JSON mode)
+            start = raw_content.find("{")
+            if start != -1:
+                try:
+                    analysis_data, _ = json.JSONDecoder().raw_decode(raw_content, start)
+                except ValueError:
+                    pass
+        # Valid JSON that is not an object (array, string...) is not an analysis
+        if isinstance(analysis_data, dict):
+            return analysis_data, True
         
-        return analysis_data
-
+        # Fallback: salvage what can be parsed (e.g. a truncated answer)
+        partial_analysis = parse_partial_json(raw_content)
+        if partial_analysis is not None and "resume_executif" in partial_analysis:
+            partial_analysis.setdefault("action_items", [])
+            return partial_analysis, False
+        
+        # Fallback: use raw content
+        return {
+            "resume_executif": raw_content[:500] if len(raw_content) > 500 else raw_content,
+            "action_items": []
+        }, False
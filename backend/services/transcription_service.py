@@ -4,53 +4,439 @@ Handles audio file transcription with local Whisper model
 """
 
 import os
-import tempfile
-from faster_whisper import WhisperModel
-from typing import Tuple, Optional
+import threading
+import av
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio
+from faster_whisper.utils import download_model
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Tuple, Optional, Union
+
+from ..utils.cache import DEFAULT_CACHE_DIR, ResultCache, content_hash
+
+# Silence detection settings used when vad_filter is enabled
+VAD_PARAMETERS = {"min_silence_duration_ms": 500, "speech_pad_ms": 200}
+
+# Clips shorter than this (in seconds) are transcribed with the tiny model
+SHORT_CLIP_SECONDS = 3.0
+SHORT_CLIP_MODEL_SIZE = "tiny"
+
+# English-only equivalents of the multilingual models, faster at equal accuracy
+ENGLISH_MODEL_SIZES = {"tiny": "tiny.en", "base": "base.en", "small": "distil-small.en"}
+# Audio used to detect the language (in seconds), and confidence needed to switch
+LANGUAGE_PROBE_SECONDS = 30
+ENGLISH_SWITCH_PROBABILITY = 0.9
+
+# Whisper models work on 16 kHz mono audio, in windows of 30 seconds
+SAMPLING_RATE = 16000
+WINDOW_SECONDS = 30
+
+# Directory where Whisper models are downloaded (mount it as a volume to keep
+# them across container restarts)
+DEFAULT_DOWNLOAD_ROOT = os.getenv(
+    "WHISPER_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "whisper-ct2")
+)
+
+# Part of the transcription cache keys: bump when the cached format changes
+_CACHE_FORMAT = "segments-v2"
+
+
+def probe_duration(audio_file: BinaryIO) -> Optional[float]:
+    """
+    Read the duration of an audio file from its container header, without decoding it.
+    
+    Args:
+        audio_file: Binary file-like object
+        
+    Returns:
+        Optional[float]: Duration in seconds, or None if unknown
+    """
+    try:
+        audio_file.seek(0)
+        with av.open(audio_file, metadata_errors="ignore") as container:
+            if container.duration is None:
+                return None
+            return container.duration / av.time_base
+    except Exception:
+        return None
+    finally:
+        audio_file.seek(0)
+
+
+def fixed_windows(num_samples: int) -> List[Dict]:
+    """
+    Split audio into consecutive Whisper windows, for batched decoding without VAD.
+    
+    Args:
+        num_samples: Number of 16 kHz samples of the audio
+        
+    Returns:
+        List[Dict]: Windows as {"start": seconds, "end": seconds}
+    """
+    duration = num_samples / SAMPLING_RATE
+    return [
+        {"start": float(start), "end": min(float(start + WINDOW_SECONDS), duration)}
+        for start in range(0, int(np.ceil(duration)), WINDOW_SECONDS)
+    ]
+
+
+def _cuda_available() -> bool:
+    """
+    Check whether CTranslate2 can run on a CUDA GPU.
+    """
+    try:
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count() > 0
+    except Exception:
+        return False
+
+
+def _cuda_supports_bfloat16() -> bool:
+    """
+    Check whether the GPU supports bfloat16 (Ampere or newer), which is also
+    what CTranslate2's flash attention requires.
+    """
+    try:
+        import ctranslate2
+        return "bfloat16" in ctranslate2.get_supported_compute_types("cuda", 0)
+    except Exception:
+        return False
+
+
+def _cpu_supports_vnni() -> bool:
+    """
+    Check whether the CPU supports VNNI instructions (fast int8 dot products).
+    Uses py-cpuinfo when installed, /proc/cpuinfo otherwise.
+    """
+    try:
+        import cpuinfo
+        flags = cpuinfo.get_cpu_info().get("flags", [])
+    except ImportError:
+        try:
+            with open("/proc/cpuinfo") as f:
+                flags = f.read().split()
+        except OSError:
+            return False
+    
+    return any("vnni" in flag for flag in flags)
 
 
 class TranscriptionService:
     """Service for transcribing audio files using faster-whisper"""
     
-    def __init__(self, model_size: str = "base"):
+    def __init__(
+        self, 
+        model_size: str = "base",
+        device: str = "auto",
+        compute_type: str = "auto",
+        cpu_threads: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        cache_dir: Optional[str] = os.path.join(DEFAULT_CACHE_DIR, "transcriptions"),
+        download_root: str = DEFAULT_DOWNLOAD_ROOT,
+        prefetch: bool = False
+    ):
         """
         Initialize the transcription service with a Whisper model.
         
         Args:
             model_size: Size of the Whisper model ("tiny", "base", "small")
+            device: "cuda", "cpu", or "auto" to use a CUDA GPU when available
+            compute_type: CTranslate2 compute type ("auto" picks "bfloat16" on
+                Ampere or newer GPUs, "int8_float16" on older ones, and on CPU
+                "int8" with VNNI or "int8_float32" otherwise). Flash attention
+                is enabled with float16 and bfloat16 on GPUs supporting it
+            cpu_threads: Number of threads used for inference (default: half
+                the CPU cores, capped at 8, leaving room for Streamlit and
+                the Groq requests)
+            num_workers: Number of model workers, allowing transcriptions
+                from concurrent sessions to run in parallel (default: 2 on
+                CPU, 1 on GPU where a second worker only competes for it)
+            batch_size: Default number of audio chunks decoded together when
+                VAD is on (default: 8 on GPU, 4 on CPU; 1 = sequential decoding).
+                Without VAD, decoding is sequential unless a batch size is
+                passed explicitly
+            cache_dir: Directory where transcriptions are cached across runs
+                (None = in-memory cache only)
+            download_root: Directory where model weights are downloaded
+                (default: $WHISPER_CACHE or ~/.cache/whisper-ct2)
+            prefetch: Start downloading the model weights in the background
+                right away, so they are ready when load_model is called. The
+                tiny model used for short clips is also loaded in the background
         """
+        if device == "auto":
+            device = "cuda" if _cuda_available() else "cpu"
+        if compute_type == "auto":
+            if device == "cuda":
+                compute_type = "bfloat16" if _cuda_supports_bfloat16() else "int8_float16"
+            else:
+                compute_type = "int8" if _cpu_supports_vnni() else "int8_float32"
+        if cpu_threads is None:
+            cpu_threads = min(8, max(1, (os.cpu_count() or 1) // 2))
+        if num_workers is None:
+            num_workers = 1 if device == "cuda" else 2
+        if batch_size is None:
+            batch_size = 8 if device == "cuda" else 4
+        
         self.model_size = model_size
+        self.device = device
+        self.compute_type = compute_type
+        self.flash_attention = (
+            device == "cuda"
+            and compute_type in ("float16", "bfloat16")
+            and _cuda_supports_bfloat16()
+        )
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.batch_size = batch_size
         self.model = None
+        self.batched_model = None
+        self._load_lock = threading.Lock()
+        self._prefetch_thread = None
+        # Services running other models (short clips, English audio), created on first use
+        self._variant_services = {}
+        # Model sizes whose service is loaded in the background (see _start_preload)
+        self._preloads = set()
+        self._preload_lock = threading.Lock()
+        self._warmed_up = False
+        self.cache_dir = cache_dir
+        self.download_root = download_root
+        # Transcriptions keyed by audio content and decoding options: re-uploading
+        # the same recording (even in another session) skips Whisper entirely
+        self.cache = ResultCache(maxsize=8, cache_dir=cache_dir, max_disk_entries=200)
+        
+        if prefetch:
+            self._prefetch_thread = threading.Thread(target=self._prefetch_model, daemon=True)
+            self._prefetch_thread.start()
+    
+    def _prefetch_model(self) -> None:
+        """
+        Download the model weights to the local cache (run in a background thread),
+        then start loading the short-clip model.
+        """
+        try:
+            self._model_path()
+        except Exception as e:
+            # load_model will retry the download and report the error
+            print(f"Warning: Unable to prefetch Whisper model: {str(e)}")
+        
+        if self.model_size != SHORT_CLIP_MODEL_SIZE:
+            # Separate thread: load_model only waits for the download above
+            self._start_preload(SHORT_CLIP_MODEL_SIZE)
+    
+    def preload_english_model(self) -> None:
+        """
+        Start loading the English-only equivalent of the model in the background
+        (see ENGLISH_MODEL_SIZES), so English audio doesn't wait for its download.
+        Does nothing if the model has no English-only equivalent.
+        """
+        if self.model_size in ENGLISH_MODEL_SIZES:
+            self._start_preload(ENGLISH_MODEL_SIZES[self.model_size])
+    
+    def _start_preload(self, model_size: str) -> None:
+        """
+        Load the service running another model in a background thread (once).
+        """
+        with self._preload_lock:
+            if model_size in self._preloads:
+                return
+            self._preloads.add(model_size)
+        threading.Thread(target=self._preload_variant, args=(model_size,), daemon=True).start()
+    
+    def _preload_variant(self, model_size: str) -> None:
+        """
+        Load and warm up the service running another model (blocking).
+        """
+        try:
+            self._get_variant_service(model_size).load_model(warmup=True)
+        except Exception as e:
+            # Log warning but don't fail: the selected model is used instead
+            print(f"Warning: Unable to preload Whisper model {model_size}: {str(e)}")
+    
+    def _model_path(self) -> str:
+        """
+        Get the local directory of the model weights, downloading them into
+        download_root only if they are not there yet (no network request otherwise).
+        """
+        try:
+            return download_model(self.model_size, local_files_only=True, cache_dir=self.download_root)
+        except Exception:
+            return download_model(self.model_size, cache_dir=self.download_root)
     
-    def load_model(self) -> WhisperModel:
+    def load_model(self, warmup: bool = False) -> WhisperModel:
         """
         Load the Whisper model (with caching support).
         
+        Args:
+            warmup: Also run a short transcription of silence so the first
+                real file doesn't pay for CTranslate2's kernel initialization
+        
         Returns:
             WhisperModel: The loaded Whisper model
             
         Raises:
             Exception: If model loading fails
         """
+        # The service is shared between sessions: load the model only once
+        with self._load_lock:
+            if self.model is None:
+                if self._prefetch_thread is not None:
+                    self._prefetch_thread.join()
+                
+                try:
+                    # Load faster-whisper model
+                    # The model will be automatically downloaded on first use
+                    model_path = self._model_path()
+                    model_options = dict(
+                        device=self.device, 
+                        device_index=0,
+                        compute_type=self.compute_type,
+                        cpu_threads=self.cpu_threads,
+                        num_workers=self.num_workers
+                    )
+                    if self.flash_attention:
+                        try:
+                            self.model = WhisperModel(model_path, flash_attention=True, **model_options)
+                        except (TypeError, ValueError, RuntimeError):
+                            # faster-whisper or CTranslate2 too old for flash attention
+                            # (TypeError), or a CTranslate2 build/GPU rejecting it:
+                            # load the model without it
+                            self.flash_attention = False
+                    if self.model is None:
+                        self.model = WhisperModel(model_path, **model_options)
+                    # Decodes several speech chunks per forward pass (shares the model weights)
+                    self.batched_model = BatchedInferencePipeline(model=self.model)
+                except Exception as e:
+                    raise Exception(f"Error loading Whisper model: {str(e)}")
+            
+            if warmup and not self._warmed_up:
+                self._warm_up()
+        
+        return self.model
+    
+    def _warm_up(self) -> None:
+        """
+        Transcribe one second of silence to initialize the model's kernels.
+        """
+        try:
+            segments, _ = self.model.transcribe(
+                np.zeros(SAMPLING_RATE, dtype=np.float32),
+                beam_size=1,
+                vad_filter=False
+            )
+            list(segments)
+        except Exception as e:
+            # Log warning but don't fail: warmup is only an optimization
+            print(f"Warning: Whisper warmup failed: {str(e)}")
+        self._warmed_up = True
+    
+    def stream_audio_file(
+        self, 
+        audio_file_path: Union[str, BinaryIO, np.ndarray], 
+        language: Optional[str] = None,
+        beam_size: int = 1,
+        vad_filter: bool = True,
+        batch_size: Optional[int] = None
+    ) -> Tuple[Iterator[Dict], dict]:
+        """
+        Transcribe an audio file lazily, segment by segment.
+        faster-whisper decodes segments on demand, so the model only runs
+        as the returned iterator is consumed. Callers can start working on
+        the first segments while the rest of the audio is still decoding.
+        
+        Args:
+            audio_file_path: Path to the audio file, a binary file-like object,
+                or 16 kHz mono float32 samples
+            language: Language code (None for auto-detection)
+            beam_size: Beam size for transcription (default: 1, greedy decoding)
+            vad_filter: Skip silent parts of the audio with Silero VAD
+            batch_size: Number of audio chunks decoded together
+                (None = service default with VAD, sequential decoding without;
+                1 = sequential decoding). Without VAD, batching splits the audio
+                in fixed 30 s windows, which can cut words at their boundaries
+            
+        Returns:
+            Tuple[Iterator[Dict], dict]: Iterator over segments ("start" and "end"
+                in seconds, "text") and metadata
+            
+        Raises:
+            Exception: If transcription fails (also raised while iterating)
+        """
         if self.model is None:
-            try:
-                # Load faster-whisper model
-                # The model will be automatically downloaded on first use
-                self.model = WhisperModel(
-                    self.model_size, 
-                    device="cpu", 
-                    compute_type="int8"
+            self.load_model()
+        if batch_size is None:
+            batch_size = self._default_batch_size(vad_filter)
+        
+        options = dict(
+            language=language,  # None = automatic language detection
+            beam_size=beam_size,
+            best_of=1,
+            # A single temperature disables fallback re-decoding of segments
+            temperature=0.0,
+            # Avoids repetition loops carrying over on long meetings
+            condition_on_previous_text=False,
+            # Silent parts (pauses, muted speakers) are not decoded at all
+            vad_filter=vad_filter,
+            vad_parameters=dict(VAD_PARAMETERS)
+        )
+        
+        try:
+            # The audio is decoded here; segments are generated lazily
+            # Batching encodes several windows per encoder pass and runs beam
+            # search on all of them at once. It needs the audio split into
+            # windows: speech chunks found by VAD, or fixed windows without it
+            if batch_size > 1 and vad_filter:
+                segments, info = self.batched_model.transcribe(
+                    audio_file_path,
+                    batch_size=batch_size,
+                    **options
+                )
+            elif batch_size > 1 and isinstance(audio_file_path, np.ndarray):
+                segments, info = self.batched_model.transcribe(
+                    audio_file_path,
+                    batch_size=batch_size,
+                    clip_timestamps=fixed_windows(len(audio_file_path)),
+                    **options
                 )
-            except Exception as e:
-                raise Exception(f"Error loading Whisper model: {str(e)}")
+            else:
+                segments, info = self.model.transcribe(audio_file_path, **options)
+        except Exception as e:
+            raise Exception(f"Error during transcription: {str(e)}")
         
-        return self.model
+        # Prepare metadata (available before the first segment is decoded)
+        metadata = {
+            "model_size": self.model_size,
+            "language": info.language,
+            "language_probability": info.language_probability,
+            "duration": getattr(info, "duration", None)
+        }
+        
+        return self._iter_segments(segments), metadata
+    
+    def _default_batch_size(self, vad_filter: bool) -> int:
+        """
+        Get the batch size used when none is given: batching without VAD
+        cuts the audio at fixed windows, so it is only done on request.
+        """
+        return self.batch_size if vad_filter else 1
+    
+    @staticmethod
+    def _iter_segments(segments) -> Iterator[Dict]:
+        """
+        Yield each faster-whisper segment as it is decoded, as a JSON-serializable dict.
+        """
+        try:
+            for segment in segments:
+                yield {"start": segment.start, "end": segment.end, "text": segment.text}
+        except Exception as e:
+            raise Exception(f"Error during transcription: {str(e)}")
     
     def transcribe_audio_file(
         self, 
         audio_file_path: str, 
         language: Optional[str] = None,
-        beam_size: int = 5
+        beam_size: int = 1,
+        vad_filter: bool = True,
+        batch_size: Optional[int] = None
     ) -> Tuple[str, dict]:
         """
         Transcribe an audio file to text.
@@ -58,7 +444,10 @@ class TranscriptionService:
         Args:
             audio_file_path: Path to the audio file
             language: Language code (None for auto-detection)
-            beam_size: Beam size for transcription (default: 5)
+            beam_size: Beam size for transcription (default: 1, greedy decoding)
+            vad_filter: Skip silent parts of the audio with Silero VAD
+            batch_size: Number of audio chunks decoded together
+                (None = service default with VAD, sequential decoding without)
             
         Returns:
             Tuple[str, dict]: Transcription text and metadata (language, probability, etc.)
@@ -66,50 +455,40 @@ class TranscriptionService:
         Raises:
             Exception: If transcription fails
         """
-        if self.model is None:
-            self.load_model()
+        segments, metadata = self.stream_audio_file(
+            audio_file_path,
+            language=language,
+            beam_size=beam_size,
+            vad_filter=vad_filter,
+            batch_size=batch_size
+        )
         
-        try:
-            # Transcribe audio
-            segments, info = self.model.transcribe(
-                audio_file_path,
-                language=language,  # None = automatic language detection
-                beam_size=beam_size
-            )
-            
-            # Combine all segments into full text
-            transcription_text = ""
-            for segment in segments:
-                transcription_text += segment.text + " "
-            
-            transcription_text = transcription_text.strip()
-            
-            # Prepare metadata
-            metadata = {
-                "language": info.language,
-                "language_probability": info.language_probability,
-                "duration": getattr(info, "duration", None)
-            }
-            
-            return transcription_text, metadata
-            
-        except Exception as e:
-            raise Exception(f"Error during transcription: {str(e)}")
+        # Combine all segments into full text (join avoids quadratic string copies)
+        transcription_text = " ".join(segment["text"].strip() for segment in segments)
+        
+        return transcription_text, metadata
     
     def transcribe_uploaded_file(
         self, 
         uploaded_file, 
         language: Optional[str] = None,
-        beam_size: int = 5
+        beam_size: int = 1,
+        vad_filter: bool = True,
+        batch_size: Optional[int] = None,
+        prefer_english_model: bool = False
     ) -> Tuple[str, dict]:
         """
         Transcribe an uploaded file (Streamlit UploadedFile object).
-        Creates a temporary file for faster-whisper processing.
         
         Args:
             uploaded_file: Streamlit UploadedFile object
             language: Language code (None for auto-detection)
-            beam_size: Beam size for transcription (default: 5)
+            beam_size: Beam size for transcription (default: 1, greedy decoding)
+            vad_filter: Skip silent parts of the audio with Silero VAD
+            batch_size: Number of audio chunks decoded together
+                (None = service default with VAD, sequential decoding without)
+            prefer_english_model: Transcribe English audio with the English-only
+                equivalent of the model (see stream_uploaded_file)
             
         Returns:
             Tuple[str, dict]: Transcription text and metadata
@@ -117,41 +496,196 @@ class TranscriptionService:
         Raises:
             Exception: If transcription fails
         """
-        temp_file = None
-        temp_file_path = None
+        segments, metadata = self.stream_uploaded_file(
+            uploaded_file,
+            language=language,
+            beam_size=beam_size,
+            vad_filter=vad_filter,
+            batch_size=batch_size,
+            prefer_english_model=prefer_english_model
+        )
         
-        try:
-            # Create temporary file with appropriate extension
-            file_extension = os.path.splitext(uploaded_file.name)[1] or ".mp3"
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=file_extension)
-            temp_file.write(uploaded_file.getbuffer())
-            temp_file_path = temp_file.name
-            temp_file.close()
+        transcription_text = " ".join(segment["text"].strip() for segment in segments)
+        
+        return transcription_text, metadata
+    
+    def stream_uploaded_file(
+        self, 
+        uploaded_file, 
+        language: Optional[str] = None,
+        beam_size: int = 1,
+        vad_filter: bool = True,
+        batch_size: Optional[int] = None,
+        prefer_english_model: bool = False
+    ) -> Tuple[Iterator[Dict], dict]:
+        """
+        Transcribe an uploaded file (Streamlit UploadedFile object) lazily.
+        See stream_audio_file for the streaming behaviour. Transcriptions of
+        the same audio with the same options are served from the cache.
+        
+        Args:
+            uploaded_file: Streamlit UploadedFile object
+            language: Language code (None for auto-detection)
+            beam_size: Beam size for transcription (default: 1, greedy decoding)
+            vad_filter: Skip silent parts of the audio with Silero VAD
+            batch_size: Number of audio chunks decoded together
+                (None = service default with VAD, sequential decoding without)
+            prefer_english_model: When the language is auto-detected as English,
+                transcribe with the English-only equivalent of the model
+                (see ENGLISH_MODEL_SIZES and preload_english_model)
             
-            # Transcribe the temporary file
-            transcription_text, metadata = self.transcribe_audio_file(
-                temp_file_path,
+        Returns:
+            Tuple[Iterator[Dict], dict]: Iterator over segments ("start" and "end"
+                in seconds, "text") and metadata
+            
+        Raises:
+            Exception: If transcription fails
+        """
+        # For very short clips, running a larger model costs more than it brings:
+        # use the tiny model with greedy decoding instead, once it is loaded
+        # (loading it on demand would be slower than using the current model)
+        duration = probe_duration(uploaded_file)
+        short_clip_service = self._loaded_variant(SHORT_CLIP_MODEL_SIZE)
+        if (
+            duration is not None
+            and duration < SHORT_CLIP_SECONDS
+            and self.model_size != SHORT_CLIP_MODEL_SIZE
+            and short_clip_service is not None
+        ):
+            return short_clip_service.stream_uploaded_file(
+                uploaded_file,
                 language=language,
-                beam_size=beam_size
+                beam_size=1,
+                vad_filter=vad_filter,
+                batch_size=1
             )
-            
-            return transcription_text, metadata
-            
-        except Exception as e:
-            # Clean up temporary file on error
-            if temp_file_path and os.path.exists(temp_file_path):
-                try:
-                    os.unlink(temp_file_path)
-                except:
-                    pass
-            raise e
-            
-        finally:
-            # Clean up temporary file after transcription
-            if temp_file_path and os.path.exists(temp_file_path):
+        
+        if batch_size is None:
+            batch_size = self._default_batch_size(vad_filter)
+        cache_key = content_hash(
+            uploaded_file.getbuffer(),
+            _CACHE_FORMAT,
+            self.model_size,
+            self.compute_type,
+            language or "auto",
+            str(beam_size),
+            str(vad_filter),
+            str(batch_size),
+            str(prefer_english_model)
+        )
+        cached_transcription = self.cache.get(cache_key)
+        if cached_transcription is not None:
+            return iter(cached_transcription["segments"]), cached_transcription["metadata"]
+        
+        if self.model is None:
+            self.load_model()
+        
+        audio = self._decode_upload(uploaded_file)
+        
+        service = self
+        detected_probability = None
+        if (
+            prefer_english_model
+            and language is None
+            and self.model_size in ENGLISH_MODEL_SIZES
+        ):
+            detected_language, detected_probability = self._detect_language(audio)
+            if detected_probability > ENGLISH_SWITCH_PROBABILITY:
+                # Passed to Whisper so it doesn't detect the language a second time
+                language = detected_language
+            if language == "en":
+                english_service = self._get_variant_service(ENGLISH_MODEL_SIZES[self.model_size])
                 try:
-                    os.unlink(temp_file_path)
+                    # Usually already loaded in the background (see preload_english_model)
+                    english_service.load_model()
+                    service = english_service
                 except Exception as e:
-                    # Log warning but don't fail
-                    print(f"Warning: Unable to delete temporary file: {str(e)}")
-
+                    # Log warning but don't fail: the selected model still works
+                    print(f"Warning: Unable to load English-only model: {str(e)}")
+        
+        segments, metadata = service.stream_audio_file(
+            audio,
+            language=language,
+            beam_size=beam_size,
+            vad_filter=vad_filter,
+            batch_size=batch_size
+        )
+        if language is not None and detected_probability is not None:
+            # Whisper reports a probability of 1 for a given language
+            metadata["language_probability"] = detected_probability
+        
+        return self._cache_segments(segments, metadata, cache_key), metadata
+    
+    @staticmethod
+    def _decode_upload(uploaded_file) -> np.ndarray:
+        """
+        Decode an uploaded file once, in memory, into the 16 kHz mono
+        float32 samples Whisper works on (no temporary file is written).
+        
+        Raises:
+            Exception: If the audio cannot be decoded
+        """
+        try:
+            uploaded_file.seek(0)
+            return decode_audio(uploaded_file, sampling_rate=SAMPLING_RATE)
+        except Exception as e:
+            raise Exception(f"Error decoding audio file: {str(e)}")
+    
+    def _detect_language(self, audio: np.ndarray) -> Tuple[Optional[str], float]:
+        """
+        Detect the language of audio from its first seconds.
+        
+        Returns:
+            Tuple[Optional[str], float]: Language code and its probability
+                ((None, 0.0) if detection fails)
+        """
+        try:
+            language, probability, _ = self.model.detect_language(
+                audio[:LANGUAGE_PROBE_SECONDS * SAMPLING_RATE]
+            )
+        except Exception:
+            return None, 0.0  # Keep the selected model
+        return language, probability
+    
+    def _get_variant_service(self, model_size: str) -> "TranscriptionService":
+        """
+        Get a service running another model with the same settings (created on first use).
+        """
+        with self._load_lock:
+            if model_size not in self._variant_services:
+                self._variant_services[model_size] = TranscriptionService(
+                    model_size=model_size,
+                    device=self.device,
+                    compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads,
+                    num_workers=self.num_workers,
+                    batch_size=self.batch_size,
+                    cache_dir=self.cache_dir,
+                    download_root=self.download_root
+                )
+        return self._variant_services[model_size]
+    
+    def _loaded_variant(self, model_size: str) -> Optional["TranscriptionService"]:
+        """
+        Get the service running another model if its model is already loaded (never blocks).
+        """
+        service = self._variant_services.get(model_size)
+        if service is None or service.batched_model is None:
+            return None
+        return service
+    
+    def _cache_segments(
+        self, 
+        segments: Iterable[Dict], 
+        metadata: dict, 
+        cache_key: str
+    ) -> Iterator[Dict]:
+        """
+        Yield segments and cache the transcription once fully decoded.
+        """
+        decoded_segments = []
+        for segment in segments:
+            decoded_segments.append(segment)
+            yield segment
+        
+        self.cache.set(cache_key, {"segments": decoded_segments, "metadata": metadata})
@@ -0,0 +1,197 @@
+"""
+Result cache keyed by content hash
+In-memory LRU with an optional JSON-on-disk layer for persistence across runs
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Union
+
+# Directory where results are persisted between runs (relative to the working directory)
+DEFAULT_CACHE_DIR = os.getenv("MEETFLOW_CACHE_DIR", ".meetflow_cache")
+
+# orjson parses and serializes several times faster than the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON document, using orjson when available.
+
+    Args:
+        data: JSON text (str or UTF-8 bytes)
+
+    Returns:
+        The parsed value
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(value: Any) -> bytes:
+    """
+    Serialize a value to UTF-8 JSON bytes, using orjson when available.
+
+    Args:
+        value: JSON-serializable value
+
+    Returns:
+        bytes: UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def content_hash(*parts: Union[str, bytes, memoryview]) -> str:
+    """
+    Compute a short, stable hash of one or more strings or byte buffers.
+
+    Args:
+        *parts: Strings or bytes identifying the cached content
+
+    Returns:
+        str: Hexadecimal blake2b digest (32 characters)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+        # Separator so ("ab", "c") and ("a", "bc") hash differently
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Thread-safe LRU cache of JSON-serializable results, optionally persisted to disk"""
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        cache_dir: Optional[str] = None,
+        max_disk_entries: int = 1000
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries kept in memory
+            cache_dir: Directory for persistent entries (None = memory only)
+            max_disk_entries: Maximum number of entries kept on disk; the least
+                recently used ones are deleted beyond that
+        """
+        self.maxsize = maxsize
+        self.max_disk_entries = max_disk_entries
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached result, checking memory first and then disk.
+
+        Args:
+            key: Cache key (see content_hash)
+
+        Returns:
+            The cached result, or None if not cached
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                value = json_loads(f.read())
+            # Mark the entry as recently used, so pruning keeps it
+            os.utime(path)
+        except (OSError, ValueError):
+            # Unreadable or corrupted entry: treat as a cache miss
+            return None
+
+        self._remember(key, value)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a result in memory and, if enabled, on disk.
+
+        Args:
+            key: Cache key (see content_hash)
+            value: JSON-serializable result
+        """
+        self._remember(key, value)
+
+        path = self._path(key)
+        if path is None:
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(json_dumps(value))
+            os.replace(temp_path, path)
+        except OSError as e:
+            # Log warning but don't fail: the memory cache still works
+            print(f"Warning: Unable to write cache entry: {str(e)}")
+            return
+
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """
+        Delete the least recently used disk entries beyond max_disk_entries.
+        """
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                files = [
+                    (entry.stat().st_mtime, entry.path)
+                    for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file()
+                ]
+        except OSError:
+            return
+
+        if len(files) <= self.max_disk_entries:
+            return
+
+        files.sort()
+        for _, path in files[:len(files) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Already removed (e.g. by another process)
+
+    def _remember(self, key: str, value: Any) -> None:
+        """
+        Store a result in the in-memory LRU, evicting the oldest entry if full.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> Optional[str]:
+        """
+        Get the disk path of a cache entry (None if disk caching is disabled).
+        """
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, f"{key}.json")
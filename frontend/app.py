@@ -11,12 +11,27 @@ This frontend uses:
 import streamlit as st
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path to import backend modules
+# (imported where they are used: faster-whisper and Groq are slow to import,
+# so the page starts rendering before they are loaded)
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.services.transcription_service import TranscriptionService
-from backend.services.analysis_service import AnalysisService
+# Approximate transcript size (in tokens) sent to Groq per analysis chunk
+ANALYSIS_CHUNK_TOKENS = 2000
+# The first chunk is sent earlier, so Groq starts working within the first minutes of audio
+FIRST_ANALYSIS_CHUNK_TOKENS = 500
+# A chunk is only sent once this much text follows it: a smaller last
+# chunk is appended to it instead of being analyzed alone
+MIN_ANALYSIS_CHUNK_TOKENS = 500
+# Recordings this long are expected to exceed SINGLE_CALL_MAX_TOKENS, so their
+# chunks are analyzed during transcription (in seconds; shorter recordings wait
+# until their transcript is known to be long)
+LONG_RECORDING_SECONDS = 15 * 60
+# Minimum delay between two refreshes of the live transcript (in seconds)
+TRANSCRIPT_REFRESH_SECONDS = 0.5
 
 # Define get_groq_api_key function directly (works in all environments)
 # In production (Streamlit Cloud, GitHub Actions), uses environment variables
@@ -57,9 +72,22 @@ st.set_page_config(
 
 # ==================== INITIALIZE SERVICES ====================
 # Initialize services with error handling
+@st.cache_resource
+def get_analysis_service(api_key):
+    """
+    Get analysis service with cache so its HTTP connection pool survives reruns.
+    """
+    from backend.services.analysis_service import AnalysisService
+    
+    # Racing the models is faster when one is failing, but uses more of the API quota
+    return AnalysisService(
+        api_key=api_key,
+        race_models=os.getenv("MEETFLOW_RACE_MODELS") == "1"
+    )
+
 try:
     api_key = get_groq_api_key()
-    analysis_service = AnalysisService(api_key=api_key)
+    analysis_service = get_analysis_service(api_key)
 except ValueError as e:
     st.error("❌ GROQ_API_KEY not found. Please set it as:")
     st.error("1. Environment variable: `GROQ_API_KEY`")
@@ -84,10 +112,52 @@ with st.sidebar:
     st.markdown("### 🎤 Whisper Model")
     whisper_model_size = st.selectbox(
         "Model size (smaller = faster)",
-        ["tiny", "base", "small"],
+        ["tiny", "base", "small", "tiny.en", "base.en", "distil-small.en", "distil-medium.en"],
         index=1,
-        help="tiny = very fast, base = balanced, small = more accurate"
+        help="tiny = very fast, base = balanced, small = more accurate. "
+             "'.en' models only transcribe English, faster at equal accuracy "
+             "(distil models are about twice as fast as their full-size equivalent)."
+    )
+    prefer_english_model = st.toggle(
+        "English-only model for English audio",
+        value=True,
+        disabled=whisper_model_size not in ("tiny", "base", "small"),
+        help="Detects the language on the first 30 seconds and, for English audio, "
+             "switches to tiny.en, base.en or distil-small.en"
     )
+    device = st.radio(
+        "Device",
+        ["auto", "cpu", "cuda"],
+        index=0,
+        horizontal=True,
+        help="auto = NVIDIA GPU (CUDA) when available, CPU otherwise. "
+             "On GPU, the 'small' model needs about 2 GB of VRAM."
+    )
+    compute_type = st.radio(
+        "Precision",
+        ["auto", "int8", "int8_float16", "float16"],
+        index=0,
+        horizontal=True,
+        help="auto = bfloat16 with flash attention on recent GPUs (Ampere or newer), "
+             "int8_float16 on older GPUs; on CPU int8 with VNNI, int8_float32 otherwise. "
+             "int8 weights use half the memory of float16 and are faster "
+             "(float16 variants require a GPU)."
+    )
+    skip_silence = st.toggle(
+        "Skip silence",
+        value=True,
+        help="Detects silent parts (pauses, muted speakers) and skips them during transcription"
+    )
+    # Filled once the transcription service is created (depends on the resolved device)
+    service_settings = st.container()
+    with st.expander("Advanced"):
+        beam_size = st.select_slider(
+            "Decoder beam",
+            options=[1, 3, 5],
+            value=1,
+            help="1 = greedy decoding (fastest). Beam search (3 or 5) is several times "
+                 "slower for a marginal accuracy gain on conversational audio."
+        )
     
     st.markdown("---")
     st.markdown("### 📋 Supported Formats")
@@ -104,67 +174,211 @@ with st.sidebar:
 
 # ==================== FUNCTION TO LOAD WHISPER MODEL ====================
 @st.cache_resource
-def get_transcription_service(model_size="base"):
+def get_transcription_service(model_size="base", device="auto", compute_type="auto"):
     """
     Get transcription service with cache to avoid reloading model every time.
     """
-    return TranscriptionService(model_size=model_size)
+    from backend.services.transcription_service import TranscriptionService
+    
+    return TranscriptionService(
+        model_size=model_size,
+        device=device,
+        compute_type=compute_type,
+        prefetch=True
+    )
 
-# ==================== FILE UPLOAD ====================
-st.header("📤 Upload Recording")
-uploaded_file = st.file_uploader(
-    "Choose an audio file",
-    type=["mp3", "wav", "m4a"],
-    help="Supported formats: MP3, WAV, M4A"
-)
+# Start fetching the selected model now rather than on the first analysis
+transcription_service = get_transcription_service(whisper_model_size, device, compute_type)
 
-# ==================== TRAITEMENT ====================
-if uploaded_file is not None:
-    # Display file information
-    file_details = {
-        "File name": uploaded_file.name,
-        "File type": uploaded_file.type,
-        "Size": f"{uploaded_file.size / (1024*1024):.2f} MB"
-    }
+with service_settings:
+    # Show where Whisper actually runs, so a GPU left unused doesn't go unnoticed
+    st.caption(
+        f"Running on **{transcription_service.device.upper()}** "
+        f"({transcription_service.compute_type}, "
+        f"CPU threads: {transcription_service.cpu_threads}, "
+        f"workers: {transcription_service.num_workers}"
+        + (", flash attention" if transcription_service.flash_attention else "")
+        + ")"
+    )
+    st.caption(f"Model cache: `{transcription_service.download_root}`")
+    batch_size = st.slider(
+        "Batch size",
+        min_value=1,
+        max_value=16,
+        # Without VAD, batching is opt-in: the default becomes sequential decoding
+        value=transcription_service.batch_size if skip_silence else 1,
+        help="Number of audio chunks transcribed together, also with beam search "
+             "(higher = faster, uses more memory). 1 = sequential decoding. "
+             "With 'Skip silence' off, batching splits the audio into fixed 30 s "
+             "windows and may cut or garble words at their boundaries."
+    )
+
+# ==================== LIVE ANALYSIS RENDERING ====================
+def render_partial_analysis(summary_placeholder, items_placeholder, analysis):
+    """
+    Render a (possibly incomplete) analysis while Groq is still answering.
+    """
+    resume = analysis.get("resume_executif")
+    if resume:
+        summary_placeholder.info(resume)
     
-    with st.expander("📄 File Details"):
-        for key, value in file_details.items():
-            st.text(f"{key}: {value}")
+    action_items = analysis.get("action_items")
+    if not isinstance(action_items, list):
+        action_items = []
+    action_items = [
+        item for item in action_items
+        if isinstance(item, dict) and item.get("tache")
+    ]
+    if action_items:
+        items_placeholder.markdown("\n".join(
+            f"- **{item['tache']}** — *{item.get('responsable', 'Not assigned')}*"
+            for item in action_items
+        ))
+
+# ==================== PROCESSING ====================
+def get_result_key(uploaded_file):
+    """
+    Get the session state key holding the results of an upload with the
+    current settings, kept across reruns (widget changes, downloads) so they
+    are displayed without reprocessing.
+    """
+    return "result_" + "_".join([
+        uploaded_file.file_id,
+        whisper_model_size,
+        device,
+        compute_type,
+        str(beam_size),
+        str(skip_silence),
+        str(batch_size),
+        str(prefer_english_model)
+    ])
+
+
+def process_recording(uploaded_file, duration=None):
+    """
+    Transcribe and analyze one recording, showing progress as it goes.
     
-    st.markdown("---")
+    Args:
+        uploaded_file: Streamlit UploadedFile object
+        duration: Duration of the recording in seconds (None if unknown)
     
-    # Button to start analysis
-    if st.button("🚀 Analyze Meeting", type="primary", use_container_width=True):
+    Returns:
+        dict: Transcription and analysis, or None if the transcription failed
+    """
+    from backend.services.analysis_service import (
+        MAX_PARALLEL_CHUNKS,
+        SINGLE_CALL_MAX_TOKENS,
+        estimate_tokens
+    )
+    
+    # Use st.status to display processing steps
+    with st.status(f"🔄 Processing {uploaded_file.name}...", expanded=True) as status:
         
-        # Use st.status to display processing steps
-        with st.status("🔄 Processing...", expanded=True) as status:
-            
-            # ==================== STEP 1: LOAD MODEL ====================
-            status.update(label="📦 Loading Whisper model...", state="running")
-            try:
-                transcription_service = get_transcription_service(whisper_model_size)
-                transcription_service.load_model()
-            except Exception as e:
-                st.error(f"❌ Unable to load Whisper model: {str(e)}")
+        # ==================== STEP 1: LOAD MODEL ====================
+        status.update(label="📦 Loading Whisper model...", state="running")
+        try:
+            transcription_service.load_model()
+        except Exception as e:
+            st.error(f"❌ Unable to load Whisper model: {str(e)}")
+            if "CUDA" in str(e) or "cuda" in str(e).lower():
+                st.error("💡 **Help:** No usable GPU found. Select 'auto' or 'cpu' as device in the sidebar.")
+            elif "compute type" in str(e).lower():
+                st.error("💡 **Help:** This precision is not supported on this device. Select 'auto' or 'int8'.")
+            else:
                 st.error("💡 **Help:** Make sure faster-whisper is correctly installed.")
                 st.error("Try: `pip install faster-whisper`")
-                st.stop()
-            
-            # ==================== STEP 2: TRANSCRIPTION ====================
-            status.update(label="🎤 Transcribing audio (local faster-whisper)...", state="running")
-            
+            st.stop()
+        
+        # ==================== STEP 2: TRANSCRIPTION + CHUNK ANALYSIS ====================
+        # Segments are analyzed by Groq in chunks while Whisper keeps decoding
+        status.update(label=f"🎤 Transcribing {uploaded_file.name} (local faster-whisper)...", state="running")
+        live_transcript = st.empty()
+        last_refresh = 0.0
+        partial_summaries = st.empty()
+        transcription_segments = []
+        transcription_parts = []
+        chunk_parts = []
+        chunk_tokens = 0
+        transcript_tokens = 0
+        # Complete chunk waiting for enough text after it to be sent
+        held_chunk = None
+        chunk_futures = []
+        long_recording = duration is not None and duration >= LONG_RECORDING_SECONDS
+        
+        # Sized like the Groq connection pool: chunks queued at once (transcription
+        # cache hit, fast GPU) are all analyzed in parallel
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_CHUNKS) as executor:
             try:
-                transcription_text, metadata = transcription_service.transcribe_uploaded_file(
+                segments, metadata = transcription_service.stream_uploaded_file(
                     uploaded_file,
                     language=None,  # Automatic language detection
-                    beam_size=5
+                    beam_size=beam_size,
+                    vad_filter=skip_silence,
+                    batch_size=batch_size,
+                    prefer_english_model=prefer_english_model
                 )
                 
+                for segment in segments:
+                    text = segment["text"].strip()
+                    transcription_segments.append({**segment, "text": text})
+                    transcription_parts.append(text)
+                    chunk_parts.append(text)
+                    text_tokens = estimate_tokens(text)
+                    chunk_tokens += text_tokens
+                    transcript_tokens += text_tokens
+                    
+                    # Show the transcript as it is decoded (throttled: each
+                    # refresh sends the whole text to the browser)
+                    if time.monotonic() - last_refresh >= TRANSCRIPT_REFRESH_SECONDS:
+                        live_transcript.code(
+                            " ".join(transcription_parts),
+                            language=None,
+                            wrap_lines=True,
+                            height=200
+                        )
+                        last_refresh = time.monotonic()
+                    
+                    # Send the held chunk to Groq without waiting for the rest of
+                    # the audio, once it is known not to be followed by a tiny tail
+                    if held_chunk is not None and chunk_tokens >= MIN_ANALYSIS_CHUNK_TOKENS:
+                        chunk_futures.append(
+                            executor.submit(analysis_service.analyze_chunk, held_chunk)
+                        )
+                        held_chunk = None
+                    
+                    # Short transcripts get a single analysis call: only cut chunks
+                    # once the transcript is known to be long
+                    chunk_limit = ANALYSIS_CHUNK_TOKENS if chunk_futures else FIRST_ANALYSIS_CHUNK_TOKENS
+                    if (
+                        (long_recording or transcript_tokens > SINGLE_CALL_MAX_TOKENS)
+                        and chunk_tokens >= chunk_limit
+                    ):
+                        held_chunk = " ".join(chunk_parts)
+                        chunk_parts = []
+                        chunk_tokens = 0
+                    
+                    # Show the summaries of the chunks analyzed so far
+                    done_summaries = [
+                        future.result().get("resume_executif", "")
+                        for future in chunk_futures
+                        if future.done() and future.exception() is None
+                    ]
+                    if done_summaries:
+                        partial_summaries.markdown(
+                            "**Partial summaries:**\n\n"
+                            + "\n\n".join(f"- {summary}" for summary in done_summaries)
+                        )
+                
+                transcription_text = " ".join(transcription_parts)
+                # The complete transcript is shown in the results below
+                live_transcript.empty()
+                
                 # Display transcription information
                 st.success(
                     f"✅ Transcription complete! "
                     f"(Detected language: {metadata['language']}, "
-                    f"Probability: {metadata['language_probability']:.2%})"
+                    f"Probability: {metadata['language_probability']:.2%}, "
+                    f"Model: {metadata.get('model_size', whisper_model_size)})"
                 )
                 
             except Exception as e:
@@ -172,20 +386,50 @@ if uploaded_file is not None:
                 st.error(f"❌ Error during transcription: {error_msg}")
                 
                 # Specific help messages for common errors
-                if "No such file" in error_msg or "path" in error_msg.lower():
-                    st.error("💡 **Help:** File path issue.")
-                    st.error("Make sure faster-whisper can access the temporary file.")
+                if "decoding audio" in error_msg:
+                    st.error("💡 **Help:** The file could not be read as audio.")
+                    st.error("Make sure it is a valid MP3, WAV or M4A file.")
                 elif "CUDA" in error_msg or "cuda" in error_msg.lower():
-                    st.info("💡 The model uses CPU by default. This is normal if you don't have a GPU.")
+                    st.info("💡 No usable GPU found. Select 'auto' or 'cpu' as device in the sidebar.")
                 
-                st.stop()
+                # Let the other recordings go on
+                status.update(label=f"❌ {uploaded_file.name}: transcription failed", state="error")
+                return None
             
             # ==================== STEP 3: GROQ ANALYSIS ====================
             status.update(label="🧠 Analyzing content with Groq (open source LLM)...", state="running")
             
             try:
-                analysis_data = analysis_service.analyze_meeting(transcription_text)
-                status.update(label="✅ Analysis complete!", state="complete")
+                last_chunks = []
+                if held_chunk is not None:
+                    if chunk_parts and chunk_tokens < MIN_ANALYSIS_CHUNK_TOKENS:
+                        # Too short to be analyzed alone: part of the held chunk
+                        held_chunk = " ".join([held_chunk] + chunk_parts)
+                        chunk_parts = []
+                    last_chunks.append(held_chunk)
+                if chunk_parts:
+                    last_chunks.append(" ".join(chunk_parts))
+                
+                if chunk_futures or len(last_chunks) > 1:
+                    # Long meeting: analyze the last chunks, then merge all partial analyses
+                    chunk_futures.extend(
+                        executor.submit(analysis_service.analyze_chunk, chunk_text)
+                        for chunk_text in last_chunks
+                    )
+                    partial_analyses = [future.result() for future in chunk_futures]
+                    analysis_stream = analysis_service.stream_merged_analysis(partial_analyses)
+                else:
+                    # Short meeting (a single chunk): one call is enough
+                    analysis_stream = analysis_service.stream_meeting_analysis(transcription_text)
+                
+                # Show the summary and action items as Groq writes them
+                partial_summaries.empty()
+                summary_placeholder = st.empty()
+                items_placeholder = st.empty()
+                for analysis_data in analysis_stream:
+                    render_partial_analysis(summary_placeholder, items_placeholder, analysis_data)
+                status.update(label=f"✅ {uploaded_file.name}: analysis complete!", state="complete")
+                analysis_failed = False
                 
             except Exception as e:
                 st.error(f"❌ Error during Groq analysis: {str(e)}")
@@ -194,63 +438,167 @@ if uploaded_file is not None:
                     "resume_executif": "Error during analysis. Please check your Groq API key.",
                     "action_items": []
                 }
+                analysis_failed = True
+    
+    result = {
+        "transcription": transcription_text,
+        "segments": transcription_segments,
+        "analysis": analysis_data
+    }
+    # Failed analyses are not kept, so clicking again retries them
+    if not analysis_failed:
+        st.session_state[get_result_key(uploaded_file)] = result
+    return result
+
+
+@st.fragment
+def render_results(uploaded_file, result):
+    """
+    Display the transcription and analysis of one recording in tabs.
+    Runs as a fragment: interactions with the results only rerun this
+    function, not the whole script (services, uploads, processing).
+    """
+    transcription_text = result["transcription"]
+    analysis_data = result["analysis"]
+    
+    st.markdown("---")
+    
+    # ==================== DISPLAY RESULTS IN TABS ====================
+    st.header(f"📊 Analysis Results — {uploaded_file.name}")
+    
+    # Create tabs
+    tab1, tab2, tab3 = st.tabs([
+        "📝 Transcription",
+        "📋 Executive Summary",
+        "✅ Action Items"
+    ])
+    
+    # Tab 1: Complete transcription
+    with tab1:
+        st.subheader("🎤 Complete Transcription")
+        st.markdown("**Raw meeting text:**")
+        # The table only renders the visible rows (virtual scrolling), which
+        # keeps long transcripts fast to display; the download has the full text
+        st.dataframe(
+            result["segments"],
+            height=400,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "start": st.column_config.NumberColumn("Start (s)", format="%.1f", width="small"),
+                "end": st.column_config.NumberColumn("End (s)", format="%.1f", width="small"),
+                "text": st.column_config.TextColumn("Text", width="large")
+            }
+        )
+        # Download button
+        st.download_button(
+            label="💾 Download Transcription",
+            data=transcription_text,
+            file_name=f"transcription_{uploaded_file.name}.txt",
+            mime="text/plain",
+            key=f"download_{uploaded_file.file_id}",
+            # Downloading doesn't need to rerun the script
+            on_click="ignore"
+        )
+    
+    # Tab 2: Executive Summary
+    with tab2:
+        st.subheader("📋 Executive Summary")
+        st.markdown("**Meeting summary:**")
+        resume = analysis_data.get("resume_executif", "No summary available")
+        st.info(resume)
+    
+    # Tab 3: Action Items
+    with tab3:
+        st.subheader("✅ Action Items")
+        st.markdown("**Identified tasks and responsible persons:**")
         
-        st.markdown("---")
-        
-        # ==================== DISPLAY RESULTS IN TABS ====================
-        st.header("📊 Analysis Results")
-        
-        # Create tabs
-        tab1, tab2, tab3 = st.tabs([
-            "📝 Transcription",
-            "📋 Executive Summary",
-            "✅ Action Items"
-        ])
-        
-        # Tab 1: Complete transcription
-        with tab1:
-            st.subheader("🎤 Complete Transcription")
-            st.markdown("**Raw meeting text:**")
-            st.text_area(
-                "Transcription",
-                value=transcription_text,
-                height=400,
-                label_visibility="collapsed"
+        action_items = analysis_data.get("action_items") or []
+        if not isinstance(action_items, list):
+            action_items = []
+        action_items = [item for item in action_items if isinstance(item, dict)]
+        if action_items:
+            # A single markdown element for all items instead of two per item
+            st.markdown("\n\n---\n\n".join(
+                f"**{idx}. {item.get('tache', 'Task not specified')}**\n"
+                f"- 👤 Responsible: *{item.get('responsable', 'Not assigned')}*"
+                for idx, item in enumerate(action_items, 1)
+            ) + "\n\n---")
+        else:
+            st.info("No action items detected in this meeting.")
+
+
+# ==================== FILE UPLOAD ====================
+st.header("📤 Upload Recordings")
+uploaded_files = st.file_uploader(
+    "Choose one or more audio files",
+    type=["mp3", "wav", "m4a"],
+    accept_multiple_files=True,
+    help="Supported formats: MP3, WAV, M4A"
+)
+
+# Load the model while the user picks a file (once per model, then cached)
+with st.spinner("⏳ Warming up the Whisper model..."):
+    try:
+        transcription_service.load_model(warmup=True)
+    except Exception:
+        # Reported with help messages when the analysis starts
+        pass
+if prefer_english_model:
+    # English audio would otherwise wait for the English-only model to download and load
+    transcription_service.preload_english_model()
+
+# ==================== TRAITEMENT ====================
+if uploaded_files:
+    from backend.services.transcription_service import probe_duration
+    
+    # Shortest recordings first, so their results show up without waiting for the long ones
+    durations = {
+        uploaded_file.file_id: probe_duration(uploaded_file)
+        for uploaded_file in uploaded_files
+    }
+    uploaded_files = sorted(
+        uploaded_files,
+        key=lambda uploaded_file: durations[uploaded_file.file_id] or float("inf")
+    )
+    
+    # Display file information
+    with st.expander("📄 File Details"):
+        for uploaded_file in uploaded_files:
+            duration = durations[uploaded_file.file_id]
+            st.text(
+                f"{uploaded_file.name} — {uploaded_file.type} — "
+                f"{uploaded_file.size / (1024*1024):.2f} MB"
+                + (f" — {duration / 60:.1f} min" if duration is not None else "")
             )
-            # Download button
-            st.download_button(
-                label="💾 Download Transcription",
-                data=transcription_text,
-                file_name=f"transcription_{uploaded_file.name}.txt",
-                mime="text/plain"
+    
+    st.markdown("---")
+    
+    results = {
+        uploaded_file.file_id: st.session_state.get(get_result_key(uploaded_file))
+        for uploaded_file in uploaded_files
+    }
+    pending_files = [
+        uploaded_file for uploaded_file in uploaded_files
+        if results[uploaded_file.file_id] is None
+    ]
+    
+    # Recordings already analyzed in this session
+    for uploaded_file in uploaded_files:
+        if results[uploaded_file.file_id] is not None:
+            render_results(uploaded_file, results[uploaded_file.file_id])
+    
+    # Button to start analysis
+    if pending_files and st.button("🚀 Analyze Meeting", type="primary", use_container_width=True):
+        for uploaded_file in pending_files:
+            results[uploaded_file.file_id] = process_recording(
+                uploaded_file, durations[uploaded_file.file_id]
             )
-        
-        # Tab 2: Executive Summary
-        with tab2:
-            st.subheader("📋 Executive Summary")
-            st.markdown("**Meeting summary:**")
-            resume = analysis_data.get("resume_executif", "No summary available")
-            st.info(resume)
-        
-        # Tab 3: Action Items
-        with tab3:
-            st.subheader("✅ Action Items")
-            st.markdown("**Identified tasks and responsible persons:**")
-            
-            action_items = analysis_data.get("action_items", [])
-            if action_items:
-                for idx, item in enumerate(action_items, 1):
-                    tache = item.get("tache", "Task not specified")
-                    responsable = item.get("responsable", "Not assigned")
-                    
-                    st.markdown(f"""
-                    **{idx}. {tache}**
-                    - 👤 Responsible: *{responsable}*
-                    """)
-                    st.markdown("---")
-            else:
-                st.info("No action items detected in this meeting.")
-        
+            # Show each result as soon as it is ready, not after the last recording
+            if results[uploaded_file.file_id] is not None:
+                render_results(uploaded_file, results[uploaded_file.file_id])
+    
+    if all(result is not None for result in results.values()):
         # Completion message
         st.markdown("---")
         st.success("🎉 Analysis completed successfully!")
@@ -1,52 +1,52 @@
 """
 Test script to verify all imports work correctly
-Used in GitHub Actions workflow
+Used in GitHub Actions workflow (run with `python -X importtime` for a detailed breakdown)
 """
 
+import importlib
 import sys
 import os
+import time
+import traceback
 
 # Add project root to path
 project_root = os.path.dirname(os.path.abspath(__file__))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+# External dependencies first, so backend timings only count the backend itself
+MODULES = [
+    "streamlit",
+    "groq",
+    "faster_whisper",
+    "backend.utils.cache",
+    "backend.services.transcription_service",
+    "backend.services.analysis_service",
+]
+
+
 def test_imports():
     """Test all required imports"""
-    print("Testing external dependencies...")
-    try:
-        import streamlit
-        import groq
-        import faster_whisper
-        print("✅ All external imports successful")
-    except ImportError as e:
-        print(f"❌ External import failed: {e}")
-        sys.exit(1)
-    
-    print("\nTesting backend imports...")
     print(f"Current working directory: {os.getcwd()}")
     print(f"Python path: {sys.path[:3]}...")  # Show first 3 entries
-    
-    try:
-        from backend.services.transcription_service import TranscriptionService
-        print("✅ TranscriptionService import successful")
-    except ImportError as e:
-        print(f"❌ TranscriptionService import failed: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-    
-    try:
-        from backend.services.analysis_service import AnalysisService
-        print("✅ AnalysisService import successful")
-    except ImportError as e:
-        print(f"❌ AnalysisService import failed: {e}")
-        import traceback
-        traceback.print_exc()
+
+    failed = []
+    for module_name in MODULES:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            failed.append(module_name)
+            print(f"❌ {module_name} import failed: {e}")
+            traceback.print_exc(file=sys.stdout)  # stderr is redirected to the importtime log in CI
+            continue
+        print(f"✅ {module_name}: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if failed:
+        print(f"\n❌ {len(failed)} import(s) failed: {', '.join(failed)}")
         sys.exit(1)
-    
+
     print("\n✅ All imports successful!")
 
 if __name__ == "__main__":
     test_imports()
-
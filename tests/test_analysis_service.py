@@ -0,0 +1,115 @@
+"""
+Tests of the Groq answer parsing and transcript helpers of the analysis service
+"""
+
+from backend.services.analysis_service import (
+    AnalysisService,
+    estimate_tokens,
+    merge_action_items,
+    parse_partial_json,
+    split_text,
+)
+
+ANALYSIS = '{"resume_executif": "Budget {Q3} review", "action_items": [{"tache": "Send report", "responsable": "Alice"}]}'
+FENCED_ANALYSIS = f"Here is the JSON:\n```json\n{ANALYSIS}\n```\nLet me know if you need anything else."
+
+
+def test_parse_partial_json_complete_object():
+    assert parse_partial_json(ANALYSIS)["action_items"][0]["tache"] == "Send report"
+
+
+def test_parse_partial_json_closes_truncated_string():
+    assert parse_partial_json('{"resume_executif": "Budget re') == {"resume_executif": "Budget re"}
+
+
+def test_parse_partial_json_drops_incomplete_member():
+    text = '{"resume_executif": "Done", "action_items": [{"tache": "Send report", "respons'
+    assert parse_partial_json(text) == {
+        "resume_executif": "Done",
+        "action_items": [{"tache": "Send report"}],
+    }
+
+
+def test_parse_partial_json_skips_text_and_code_fence():
+    assert parse_partial_json(FENCED_ANALYSIS)["resume_executif"] == "Budget {Q3} review"
+    # While the introduction is streaming, nothing can be parsed yet
+    assert parse_partial_json("Here is the JSON:\n```json\n") is None
+    # Partial object after the introduction
+    assert parse_partial_json(FENCED_ANALYSIS[:FENCED_ANALYSIS.index("Q3")]) == {
+        "resume_executif": "Budget {"
+    }
+
+
+def test_parse_partial_json_rejects_non_objects():
+    assert parse_partial_json("[1, 2]") is None
+    assert parse_partial_json("") is None
+
+
+def test_parse_analysis_valid_json():
+    analysis, well_formed = AnalysisService._parse_analysis(ANALYSIS)
+    assert well_formed
+    assert analysis["resume_executif"] == "Budget {Q3} review"
+
+
+def test_parse_analysis_fenced_json():
+    analysis, well_formed = AnalysisService._parse_analysis(FENCED_ANALYSIS)
+    assert well_formed
+    assert analysis["action_items"] == [{"tache": "Send report", "responsable": "Alice"}]
+
+
+def test_parse_analysis_non_object_is_not_well_formed():
+    for raw_content in ("[1, 2]", '"summary"', "42"):
+        analysis, well_formed = AnalysisService._parse_analysis(raw_content)
+        assert not well_formed
+        assert analysis == {"resume_executif": raw_content, "action_items": []}
+
+
+def test_parse_analysis_salvages_truncated_answer():
+    analysis, well_formed = AnalysisService._parse_analysis('{"resume_executif": "Cut sh')
+    assert not well_formed
+    assert analysis == {"resume_executif": "Cut sh", "action_items": []}
+
+
+def test_split_text_respects_token_limit():
+    text = " ".join(f"word{i}" for i in range(1000))
+    chunks = split_text(text, max_tokens=100)
+    assert len(chunks) > 1
+    assert " ".join(chunks) == text
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+
+
+def test_split_text_short_and_empty():
+    assert split_text("a short text") == ["a short text"]
+    assert split_text("") == []
+
+
+def test_merge_action_items_removes_fuzzy_duplicates():
+    merged = merge_action_items([
+        {"tache": "Send the report", "responsable": "Alice"},
+        {"tache": "send the report ", "responsable": "Bob"},
+        {"tache": "Book the room", "responsable": "Bob"},
+    ])
+    assert merged == [
+        {"tache": "Send the report", "responsable": "Alice"},
+        {"tache": "Book the room", "responsable": "Bob"},
+    ]
+
+
+def test_merge_action_items_skips_malformed_items():
+    merged = merge_action_items([
+        "Send the report",
+        {"tache": 5},
+        {"tache": "   "},
+        {"responsable": "Alice"},
+        {"tache": "Book the room"},
+    ])
+    assert merged == [{"tache": "Book the room"}]
+
+
+def test_merged_action_items_ignores_invalid_lists():
+    assert AnalysisService._merged_action_items([
+        {"action_items": None},
+        {"action_items": "none"},
+        {},
+        {"action_items": [{"tache": "Book the room"}]},
+    ]) == [{"tache": "Book the room"}]
@@ -0,0 +1,49 @@
+"""
+Tests of the result cache
+"""
+
+import os
+
+from backend.utils.cache import ResultCache, content_hash
+
+
+def test_content_hash_separates_parts():
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+    assert content_hash("ab", "c") == content_hash("ab", b"c")
+
+
+def test_memory_lru_eviction():
+    cache = ResultCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_disk_entries_survive_a_new_cache(tmp_path):
+    ResultCache(cache_dir=str(tmp_path)).set("key", {"resume_executif": "x"})
+    assert ResultCache(cache_dir=str(tmp_path)).get("key") == {"resume_executif": "x"}
+
+
+def test_disk_pruning_keeps_recently_used_entries(tmp_path):
+    cache = ResultCache(maxsize=1, cache_dir=str(tmp_path), max_disk_entries=3)
+    for idx in range(3):
+        cache.set(f"k{idx}", idx)
+        # Distinct, increasing modification times
+        os.utime(tmp_path / f"k{idx}.json", (1000 + idx, 1000 + idx))
+    
+    # Reading k0 from disk marks it as recently used
+    cache._entries.clear()
+    assert cache.get("k0") == 0
+    
+    cache.set("k3", 3)
+    remaining = sorted(path.stem for path in tmp_path.glob("*.json"))
+    assert remaining == ["k0", "k2", "k3"]
+
+
+def test_corrupted_disk_entry_is_a_miss(tmp_path):
+    (tmp_path / "bad.json").write_text("{not json")
+    assert ResultCache(cache_dir=str(tmp_path)).get("bad") is None